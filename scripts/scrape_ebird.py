@@ -6,28 +6,118 @@ Scrapes notable bird sightings from eBird alert page and saves as JSON.
 
 import asyncio
 from playwright.async_api import async_playwright
-import json
+import httpx
+from selectolax.lexbor import LexborHTMLParser
+import orjson
 import os
+import re
+import random
 import hashlib
+from urllib.parse import urljoin
 from datetime import datetime, timezone
 import logging
 
-# Setup logging
+# Setup logging - LOG_LEVEL=DEBUG also enables per-card logs and debug screenshots;
+# unknown values fall back to INFO rather than failing at import
+LOG_LEVEL = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").upper())
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL if isinstance(LOG_LEVEL, int) else logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
 # Configuration
-EBIRD_ALERT_URL = "https://ebird.org/alert/summary?sid=SN35466"
+# Alert pages to scrape - add one URL per alert (sid) to cover several locations
+EBIRD_ALERT_URLS = [
+    "https://ebird.org/alert/summary?sid=SN35466",
+]
+# Cornell CAS sign-in page that eBird redirects to; used by the static (no browser) fetch
+EBIRD_LOGIN_URL = "https://secure.birds.cornell.edu/cassso/login?service=https://ebird.org/login/cas?portal=ebird"
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
 # Recent observations page - pulls all recent sightings, not just notable/rare
 # Change the region code (e.g., US-PA, GB-ENG, SN) to match your area of interest
 EBIRD_RECENT_URL = "https://ebird.org/region/US-NY/recent"
-OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "birds.json")
+OUTPUT_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "birds.json"))
+os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+# Session cookies that indicate a signed-in eBird/Cornell account (lowercase, adjust as needed)
+AUTH_COOKIE_NAMES = {"ebird_sessionid", "sessionid", "castgc"}
+# Saved browser cookies/local storage so later local runs can skip the login flow.
+# Holds live auth cookies: never commit it or put it in a CI cache.
+STATE_FILE = os.path.join(os.path.dirname(__file__), ".ebird_state.json")
 # Set to True to fetch recent observations in addition to alerts
 FETCH_RECENT_OBSERVATIONS = True
 
+# Chromium flags for a lean one-shot headless run in CI containers
+# (/dev/shm is tiny there, and GPU/extensions/background sync are unused)
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--no-first-run',
+    '--disable-background-networking',
+    '--disable-sync',
+]
+
+# Requests the scraper never reads; aborted so pages settle faster.
+# Extraction parses raw HTML (no computed styles), so stylesheets go too.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_URL_PARTS = ("google-analytics", "googletagmanager", "doubleclick")
+
+# Elements that start a new line in innerText; their text is space-separated
+# from neighbours, while inline elements (<b>, <a>, ...) join directly
+_BLOCK_TAGS = {
+    "br", "p", "div", "li", "ul", "ol", "dl", "dt", "dd", "tr", "td", "th", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "header", "footer",
+}
+
+# Fields a sighting must have (and not as "Unknown") to be kept
+_REQUIRED_FIELDS = ("species_common_name", "location", "date")
+
+# Google Maps coordinates - pattern: @lat,lng or q=lat,lng
+_COORD_RE = re.compile(r'[@q=](-?\d+\.\d+),(-?\d+\.\d+)')
+
+# Alert observation cards. Kept as one constant so every lookup passes the
+# identical string (and hits the browser's selector cache); [class*=...] is
+# case-sensitive, so it does not cover the capitalised eBird class.
+CARD_SELECTOR = ".Observation, [class*='observation']"
+# Explicit "no observations" notice on an alert page. Only this positive signal
+# counts as an empty alert; a page with neither cards nor this notice may be
+# rendered client-side and falls back to the browser (adjust as needed)
+EMPTY_ALERT_SELECTOR = ".ResultsStats-empty, [class*='NoResults'], [class*='no-results']"
+
+# One OR'd selector per card field, applied to each parsed card by extract_card.
+# Fields ending in _href read the link target; the rest read the element text.
+_FIELD_SELECTORS = {
+    "species_common_name": ".Heading-main, .species-name, h3, h4",
+    "species_scientific_name": "em, .scientific-name, .species-scientific",
+    "location": ".Observation-location, .location, [class*='location']",
+    "date": ".Observation-meta-date, .date, [class*='date']",
+    "time": ".time, [class*='time']",
+    "observer": ".Observation-meta-user, .observer, [class*='user']",
+    "count": ".count, [class*='count']",
+    "rarity_level": ".rare, .notable, .review, [class*='rarity']",
+    "checklist_href": "a[href*='checklist']",
+    "map_href": "a[href*='google.com/maps'], a[href*='maps.google']",
+}
+
+# Recent observation rows (used for both the wait and the parse) and their
+# field selectors - eBird recent pages often use table rows
+RECENT_ROW_SELECTOR = ".Observation, .observation, [class*='observation'], tr[data-species], .ResultsStats-row, .Observation-species"
+_RECENT_FIELD_SELECTORS = {
+    "species_common_name": ".Heading-main, .species-name, .Observation-species-name, a[href*='/species/'], h3, h4, td:first-child a",
+    "species_scientific_name": "em, .scientific-name, .Observation-species-scientific",
+    "location": ".Observation-location, .location, [class*='location'], a[href*='/hotspot/'], a[href*='/region/']",
+    "date": ".Observation-meta-date, .date, [class*='date'], time",
+    "time": ".time, [class*='time']",
+    "observer": ".Observation-meta-user, .observer, [class*='user'], a[href*='/profile/']",
+    "count": ".count, [class*='count'], .Observation-numberObserved",
+    "rarity_level": ".rare, .notable, .review, [class*='rarity'], [class*='Rare']",
+    "checklist_href": "a[href*='checklist'], a[href*='/sub/']",
+    "map_href": "a[href*='google.com/maps'], a[href*='maps.google']",
+}
+
 
 async def login(page):
     """Handle eBird authentication"""
@@ -50,8 +140,16 @@ async def login(page):
             submit_button = await page.query_selector("button[type='submit'], input[type='submit']")
             if submit_button:
                 await submit_button.click()
-                await page.wait_for_load_state("networkidle", timeout=15000)
+                # Wait for the submit to navigate off the login page (page text is
+                # unreliable: the CAS login page itself has a "Create account" link)
+                await page.wait_for_url(lambda u: "login" not in u.lower(), timeout=10000)
+                if not await verify_logged_in(page):
+                    logger.warning("Left the login page but no auth cookie was set")
+                    return False
                 logger.info("Login successful")
+
+                # Persist the (verified) session for the next run
+                await page.context.storage_state(path=STATE_FILE)
                 return True
 
         logger.warning("Could not find login form elements")
@@ -62,82 +160,55 @@ async def login(page):
         return False
 
 
+async def block_unneeded_requests(route):
+    """Route handler that aborts images, fonts, media, stylesheets and analytics beacons"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
 async def verify_logged_in(page):
-    """Check if login was successful"""
-    try:
-        # Check for user-specific elements (adjust selector based on actual page)
-        # Common patterns: user menu, account button, "Sign Out" link
-        await page.wait_for_selector("text=/Sign Out|Logout|Account/i", timeout=5000)
-        return True
-    except:
+    """Check if login was successful (the one login signal used by login())"""
+    # Cheap signals instead of waiting on page text: an auth cookie is set
+    # and we were not bounced back to the login page
+    if "login" in page.url.lower():
         return False
+    cookies = await page.context.cookies()
+    return any(cookie["name"].lower() in AUTH_COOKIE_NAMES for cookie in cookies)
 
 
-async def extract_sighting_data(card):
-    """Extract data from a single observation card"""
+def build_sighting(raw, default_rarity="notable"):
+    """Turn a raw card dict from extract_card into a sighting record"""
     try:
-        sighting = {}
-
-        # Species name - adjust selectors based on actual page structure
-        species_elem = await card.query_selector(".Heading-main, .species-name, h3, h4")
-        sighting["species_common_name"] = await species_elem.inner_text() if species_elem else "Unknown"
-
-        # Scientific name - often in italics or specific class
-        scientific_elem = await card.query_selector("em, .scientific-name, .species-scientific")
-        sighting["species_scientific_name"] = await scientific_elem.inner_text() if scientific_elem else ""
-
-        # Location
-        location_elem = await card.query_selector(".Observation-location, .location, [class*='location']")
-        sighting["location"] = await location_elem.inner_text() if location_elem else "Unknown"
-
-        # Date
-        date_elem = await card.query_selector(".Observation-meta-date, .date, [class*='date']")
-        date_text = await date_elem.inner_text() if date_elem else ""
-        sighting["date"] = date_text.strip()
-
-        # Time (may not always be available)
-        time_elem = await card.query_selector(".time, [class*='time']")
-        sighting["time"] = await time_elem.inner_text() if time_elem else ""
-
-        # Observer
-        observer_elem = await card.query_selector(".Observation-meta-user, .observer, [class*='user']")
-        sighting["observer"] = await observer_elem.inner_text() if observer_elem else "Unknown"
-
-        # Count
-        count_elem = await card.query_selector(".count, [class*='count']")
-        sighting["count"] = await count_elem.inner_text() if count_elem else "1"
-
-        # Rarity level - look for badges or special indicators
-        rarity_elem = await card.query_selector(".rare, .notable, .review, [class*='rarity']")
-        sighting["rarity_level"] = await rarity_elem.inner_text() if rarity_elem else "notable"
-        sighting["rarity_level"] = sighting["rarity_level"].lower().strip()
-
-        # Checklist URL - often in a link
-        checklist_link = await card.query_selector("a[href*='checklist']")
-        if checklist_link:
-            href = await checklist_link.get_attribute("href")
-            sighting["checklist_url"] = f"https://ebird.org{href}" if href and not href.startswith("http") else href
-        else:
-            sighting["checklist_url"] = ""
+        sighting = {
+            "species_common_name": raw["species_common_name"] or "Unknown",
+            "species_scientific_name": raw["species_scientific_name"],
+            "location": raw["location"] or "Unknown",
+            "date": raw["date"],
+            "time": raw["time"],
+            "observer": raw["observer"] or "Unknown",
+            "count": raw["count"] or "1",
+            "rarity_level": (raw["rarity_level"] or default_rarity).lower(),
+        }
+
+        # Checklist URL - make relative links absolute
+        href = raw["checklist_href"]
+        sighting["checklist_url"] = f"https://ebird.org{href}" if href and not href.startswith("http") else href
 
         # Coordinates - may be in data attributes or need to be parsed from map links
-        lat_elem = await card.get_attribute("data-lat")
-        lng_elem = await card.get_attribute("data-lng")
-        sighting["latitude"] = float(lat_elem) if lat_elem else None
-        sighting["longitude"] = float(lng_elem) if lng_elem else None
+        sighting["latitude"] = float(raw["lat"]) if raw["lat"] else None
+        sighting["longitude"] = float(raw["lng"]) if raw["lng"] else None
 
         # If coordinates are in a Google Maps link
         if sighting["latitude"] is None:
-            map_link = await card.query_selector("a[href*='google.com/maps'], a[href*='maps.google']")
-            if map_link:
-                href = await map_link.get_attribute("href")
-                coords = parse_coordinates_from_url(href)
-                if coords:
-                    sighting["latitude"], sighting["longitude"] = coords
+            coords = parse_coordinates_from_url(raw["map_href"])
+            if coords:
+                sighting["latitude"], sighting["longitude"] = coords
 
         # Generate unique ID
-        id_string = f"{sighting['species_common_name']}{sighting['location']}{sighting['date']}"
-        sighting["id"] = hashlib.md5(id_string.encode()).hexdigest()[:12]
+        sighting["id"] = make_sighting_id(sighting)
 
         return sighting
 
@@ -146,15 +217,158 @@ async def extract_sighting_data(card):
         return None
 
 
+def parse_html(html):
+    """Parse page HTML, dropping script/style so their contents never leak into field text"""
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(["script", "style"])
+    return tree
+
+
+def _collect_text(node, parts):
+    """Append node's descendant text to parts, padding block elements with spaces"""
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            parts.append(child.text(deep=False))
+            continue
+        block = child.tag in _BLOCK_TAGS
+        if block:
+            parts.append(" ")
+        _collect_text(child, parts)
+        if block:
+            parts.append(" ")
+
+
+def inner_text(node):
+    """Approximate innerText: inline markup joins as-is, blocks/<br> break words,
+    and runs of whitespace collapse to one space (whitespace-only gives "")"""
+    parts = []
+    _collect_text(node, parts)
+    return " ".join("".join(parts).split())
+
+
+def extract_card(card, field_selectors=_FIELD_SELECTORS):
+    """Extract a raw card dict from a parsed (selectolax) observation card"""
+    raw = {"lat": card.attributes.get("data-lat"), "lng": card.attributes.get("data-lng")}
+    for field, selector in field_selectors.items():
+        # Lexbor's css() can match the card itself; like querySelector, only
+        # look at descendants
+        node = next((match for match in card.css(selector) if match != card), None)
+        if node is None:
+            raw[field] = ""
+        elif field.endswith("_href"):
+            raw[field] = node.attributes.get("href") or ""
+        else:
+            raw[field] = inner_text(node)
+    return raw
+
+
+def extract_sightings(observation_cards, source="alert", field_selectors=_FIELD_SELECTORS, default_rarity="notable"):
+    """Build validated sightings from parsed observation cards"""
+    logger.info(f"Found {len(observation_cards)} {source} observation cards")
+
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # Overlapping card selectors can match the same sighting more than once
+    sightings = []
+    seen_ids = set()
+    for card in observation_cards:
+        sighting = build_sighting(extract_card(card, field_selectors), default_rarity)
+        if sighting and sighting["id"] not in seen_ids and validate_sighting(sighting):
+            seen_ids.add(sighting["id"])
+            sighting["source"] = source
+            sightings.append(sighting)
+            if debug:
+                logger.debug("Extracted %s: %s at %s", source, sighting["species_common_name"], sighting["location"])
+
+    return sightings
+
+
+async def fetch_static_page(session, url):
+    """Scrape one alert page over plain HTTP; returns None if a browser is needed"""
+    response = await session.get(url)
+    final_url = str(response.url).lower()
+    if "login" in final_url or "signin" in final_url:
+        logger.info("Static fetch was redirected to login")
+        return None
+
+    tree = parse_html(response.text)
+    observation_cards = tree.css(CARD_SELECTOR)
+    if not observation_cards:
+        if tree.css_first(EMPTY_ALERT_SELECTOR) is None:
+            logger.info(f"No observation markup in static page {url}")
+            return None
+        logger.info(f"Alert page {url} has no sightings")
+
+    return extract_sightings(observation_cards)
+
+
+async def fetch_static(session):
+    """Scrape alert data over plain HTTP; returns None if a browser is needed"""
+    try:
+        logger.info("Trying static fetch of alert page...")
+
+        # Sign in through the CAS form, carrying over its hidden fields
+        response = await session.get(EBIRD_LOGIN_URL)
+        form = LexborHTMLParser(response.text).css_first("form")
+        username_input = form.css_first("input[type='text'], input[type='email']") if form else None
+        password_input = form.css_first("input[type='password']") if form else None
+        if not username_input or not password_input:
+            logger.info("Could not find static login form elements")
+            return None
+
+        data = {
+            node.attributes["name"]: node.attributes.get("value") or ""
+            for node in form.css("input[type='hidden'][name]")
+        }
+        data[username_input.attributes.get("name")] = os.environ.get("EBIRD_USERNAME", "")
+        data[password_input.attributes.get("name")] = os.environ.get("EBIRD_PASSWORD", "")
+        action = urljoin(str(response.url), form.attributes.get("action") or "")
+        await session.post(action, data=data)
+
+        # Alert pages are independent once signed in, so fetch them concurrently
+        results = await asyncio.gather(*(fetch_static_page(session, url) for url in EBIRD_ALERT_URLS))
+        if any(result is None for result in results):
+            return None
+
+        return [sighting for result in results for sighting in result]
+
+    except Exception as e:
+        logger.warning(f"Static fetch failed: {e}")
+        return None
+
+
+def browser_cookies(jar):
+    """Convert the httpx session's cookies into Playwright add_cookies() dicts"""
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value or "",
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "expires": float(cookie.expires) if cookie.expires else -1,
+            "secure": cookie.secure,
+            # cookiejar keeps the attribute's case as sent (HttpOnly, httponly, ...)
+            "httpOnly": any(attr.lower() == "httponly" for attr in cookie._rest),
+        }
+        for cookie in jar
+    ]
+
+
+def make_sighting_id(sighting):
+    """Short stable ID from species, location and date (dedup key, not security)"""
+    h = hashlib.md5(usedforsecurity=False)
+    h.update(sighting["species_common_name"].encode())
+    h.update(sighting["location"].encode())
+    h.update(sighting["date"].encode())
+    return h.hexdigest()[:12]
+
+
 def parse_coordinates_from_url(url):
     """Extract latitude and longitude from Google Maps URL"""
-    import re
     if not url:
         return None
 
-    # Pattern: @lat,lng or q=lat,lng
-    pattern = r'[@q=](-?\d+\.\d+),(-?\d+\.\d+)'
-    match = re.search(pattern, url)
+    match = _COORD_RE.search(url)
     if match:
         return float(match.group(1)), float(match.group(2))
     return None
@@ -164,17 +378,25 @@ def validate_sighting(sighting):
     """Validate required fields"""
     if not sighting:
         return False
-    required = ["species_common_name", "location", "date"]
-    return all(sighting.get(field) and sighting.get(field) != "Unknown" for field in required)
+    for field in _REQUIRED_FIELDS:
+        value = sighting.get(field)
+        if not value or value == "Unknown":
+            return False
+    return True
 
 
-async def scrape_alerts(page, max_retries=3):
+def retry_delay(attempt, max_delay=30):
+    """Exponential backoff with jitter: ~1-2s, 2-3s, 4-5s, ... capped at max_delay"""
+    return min(2 ** attempt + random.random(), max_delay)
+
+
+async def scrape_alerts(page, url, max_retries=3):
     """Scrape bird alert data with retry logic"""
     for attempt in range(max_retries):
         try:
-            logger.info(f"Navigating to {EBIRD_ALERT_URL} (attempt {attempt + 1})")
+            logger.info(f"Navigating to {url} (attempt {attempt + 1})")
 
-            await page.goto(EBIRD_ALERT_URL, wait_until="domcontentloaded", timeout=30000)
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
             # Check if redirected to login
             if "login" in page.url.lower() or "signin" in page.url.lower():
@@ -184,48 +406,31 @@ async def scrape_alerts(page, max_retries=3):
                     raise Exception("Login failed")
 
                 # Navigate to alert page again
-                await page.goto(EBIRD_ALERT_URL, wait_until="domcontentloaded", timeout=30000)
-
-            # Wait for page to load completely
-            await page.wait_for_load_state("networkidle", timeout=30000)
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
 
-            # Wait for observations to load - try multiple possible selectors
+            # Go straight to waiting for the cards themselves (or the empty-alert
+            # notice, so an empty alert returns at once) - no separate
+            # page-load wait, even after the post-login navigation
             try:
-                await page.wait_for_selector(
-                    ".Observation, .observation, .sighting, [class*='bird-card'], [class*='observation']",
-                    timeout=15000
-                )
+                await page.wait_for_selector(f"{CARD_SELECTOR}, {EMPTY_ALERT_SELECTOR}", timeout=15000)
             except:
                 logger.warning("Could not find observation elements with standard selectors")
                 # Take screenshot for debugging
-                await page.screenshot(path="debug_screenshot.png")
-                logger.info("Screenshot saved as debug_screenshot.png")
+                if logger.isEnabledFor(logging.DEBUG):
+                    await page.screenshot(path="debug_screenshot.png")
+                    logger.debug("Screenshot saved as debug_screenshot.png")
                 return []
 
-            # Extract sightings
-            sightings = []
-
-            # Try different possible selectors for observation cards
-            observation_cards = await page.query_selector_all(
-                ".Observation, .observation, .sighting, [class*='bird-card'], [class*='observation']"
-            )
-
-            logger.info(f"Found {len(observation_cards)} observation cards")
-
-            for card in observation_cards:
-                sighting = await extract_sighting_data(card)
-                if sighting and validate_sighting(sighting):
-                    sighting["source"] = "alert"
-                    sightings.append(sighting)
-                    logger.info(f"Extracted: {sighting['species_common_name']} at {sighting['location']}")
-
-            return sightings
+            # Grab the rendered HTML once and parse it in-process, rather than
+            # querying elements over the Playwright connection
+            html = await page.content()
+            return extract_sightings(parse_html(html).css(CARD_SELECTOR))
 
         except Exception as e:
             logger.error(f"Scraping attempt {attempt + 1} failed: {e}")
             if attempt == max_retries - 1:
                 raise
-            await asyncio.sleep(5)  # Wait before retry
+            await asyncio.sleep(retry_delay(attempt))  # Wait before retry
 
     return []
 
@@ -246,130 +451,34 @@ async def scrape_recent_observations(page, max_retries=3):
                     raise Exception("Login failed")
                 await page.goto(EBIRD_RECENT_URL, wait_until="domcontentloaded", timeout=30000)
 
-            # Wait for page to load
-            await page.wait_for_load_state("networkidle", timeout=30000)
-
             # Wait for observation rows to appear
             try:
-                await page.wait_for_selector(
-                    ".Observation, .observation, [class*='observation'], tr[data-species], .ResultsStats-row",
-                    timeout=15000
-                )
+                await page.wait_for_selector(RECENT_ROW_SELECTOR, timeout=15000)
             except:
                 logger.warning("Could not find recent observation elements")
-                await page.screenshot(path="debug_recent_screenshot.png")
-                logger.info("Screenshot saved as debug_recent_screenshot.png")
+                if logger.isEnabledFor(logging.DEBUG):
+                    await page.screenshot(path="debug_recent_screenshot.png")
+                    logger.debug("Screenshot saved as debug_recent_screenshot.png")
                 return []
 
-            sightings = []
-
-            # Try to find observation rows - eBird recent pages often use table rows
-            observation_rows = await page.query_selector_all(
-                ".Observation, .observation, [class*='observation'], tr[data-species], .ResultsStats-row, .Observation-species"
+            # Parse all rows from one HTML snapshot, like scrape_alerts
+            html = await page.content()
+            return extract_sightings(
+                parse_html(html).css(RECENT_ROW_SELECTOR),
+                source="recent",
+                field_selectors=_RECENT_FIELD_SELECTORS,
+                default_rarity="recent"
             )
 
-            logger.info(f"Found {len(observation_rows)} recent observation rows")
-
-            for row in observation_rows:
-                sighting = await extract_recent_observation_data(row)
-                if sighting and validate_sighting(sighting):
-                    sighting["source"] = "recent"
-                    sightings.append(sighting)
-                    logger.info(f"Extracted recent: {sighting['species_common_name']} at {sighting['location']}")
-
-            return sightings
-
         except Exception as e:
             logger.error(f"Recent observations scraping attempt {attempt + 1} failed: {e}")
             if attempt == max_retries - 1:
                 raise
-            await asyncio.sleep(5)
+            await asyncio.sleep(retry_delay(attempt))
 
     return []
 
 
-async def extract_recent_observation_data(row):
-    """Extract data from a recent observation row"""
-    try:
-        sighting = {}
-
-        # Species name - try multiple selectors
-        species_elem = await row.query_selector(
-            ".Heading-main, .species-name, .Observation-species-name, a[href*='/species/'], h3, h4, td:first-child a"
-        )
-        sighting["species_common_name"] = await species_elem.inner_text() if species_elem else "Unknown"
-        sighting["species_common_name"] = sighting["species_common_name"].strip()
-
-        # Scientific name
-        scientific_elem = await row.query_selector("em, .scientific-name, .Observation-species-scientific")
-        sighting["species_scientific_name"] = await scientific_elem.inner_text() if scientific_elem else ""
-
-        # Location
-        location_elem = await row.query_selector(
-            ".Observation-location, .location, [class*='location'], a[href*='/hotspot/'], a[href*='/region/']"
-        )
-        sighting["location"] = await location_elem.inner_text() if location_elem else "Unknown"
-        sighting["location"] = sighting["location"].strip()
-
-        # Date
-        date_elem = await row.query_selector(".Observation-meta-date, .date, [class*='date'], time")
-        date_text = await date_elem.inner_text() if date_elem else ""
-        sighting["date"] = date_text.strip()
-
-        # Time
-        time_elem = await row.query_selector(".time, [class*='time']")
-        sighting["time"] = await time_elem.inner_text() if time_elem else ""
-
-        # Observer
-        observer_elem = await row.query_selector(".Observation-meta-user, .observer, [class*='user'], a[href*='/profile/']")
-        sighting["observer"] = await observer_elem.inner_text() if observer_elem else "Unknown"
-
-        # Count
-        count_elem = await row.query_selector(".count, [class*='count'], .Observation-numberObserved")
-        sighting["count"] = await count_elem.inner_text() if count_elem else "1"
-
-        # For recent observations, default rarity to "recent" unless marked otherwise
-        rarity_elem = await row.query_selector(".rare, .notable, .review, [class*='rarity'], [class*='Rare']")
-        if rarity_elem:
-            sighting["rarity_level"] = await rarity_elem.inner_text()
-            sighting["rarity_level"] = sighting["rarity_level"].lower().strip()
-        else:
-            sighting["rarity_level"] = "recent"
-
-        # Checklist URL
-        checklist_link = await row.query_selector("a[href*='checklist'], a[href*='/sub/']")
-        if checklist_link:
-            href = await checklist_link.get_attribute("href")
-            sighting["checklist_url"] = f"https://ebird.org{href}" if href and not href.startswith("http") else href
-        else:
-            sighting["checklist_url"] = ""
-
-        # Coordinates
-        lat_elem = await row.get_attribute("data-lat")
-        lng_elem = await row.get_attribute("data-lng")
-        sighting["latitude"] = float(lat_elem) if lat_elem else None
-        sighting["longitude"] = float(lng_elem) if lng_elem else None
-
-        # Try to get coordinates from map link if not in data attributes
-        if sighting["latitude"] is None:
-            map_link = await row.query_selector("a[href*='google.com/maps'], a[href*='maps.google']")
-            if map_link:
-                href = await map_link.get_attribute("href")
-                coords = parse_coordinates_from_url(href)
-                if coords:
-                    sighting["latitude"], sighting["longitude"] = coords
-
-        # Generate unique ID
-        id_string = f"{sighting['species_common_name']}{sighting['location']}{sighting['date']}"
-        sighting["id"] = hashlib.md5(id_string.encode()).hexdigest()[:12]
-
-        return sighting
-
-    except Exception as e:
-        logger.warning(f"Failed to extract recent observation data: {e}")
-        return None
-
-
 def create_output_json(sightings, status="success", error_message=None):
     """Create final JSON structure"""
     return {
@@ -396,82 +505,140 @@ def deduplicate_sightings(sightings):
     return unique_sightings
 
 
-async def main():
-    """Main scraping function"""
-    logger.info("Starting eBird scraper...")
+async def new_scrape_context(browser, cookies=None):
+    """Create a browser context with the saved session and request blocking"""
+    # Reuse the saved session if there is one; expired sessions are caught
+    # by the login-redirect check and re-saved by login()
+    storage_state = STATE_FILE if os.path.exists(STATE_FILE) else None
+    if storage_state:
+        logger.info("Reusing saved browser session")
 
-    # Validate environment variables
-    if not os.environ.get("EBIRD_USERNAME") or not os.environ.get("EBIRD_PASSWORD"):
-        logger.error("EBIRD_USERNAME and EBIRD_PASSWORD environment variables must be set")
-        return
+    context = await browser.new_context(user_agent=USER_AGENT, storage_state=storage_state)
+    # Carry over the static fetch's CAS login so the browser does not sign in again
+    if cookies:
+        await context.add_cookies(cookies)
+    await context.route("**/*", block_unneeded_requests)
+    return context
+
+
+async def scrape_one(browser, url, cookies=None):
+    """Scrape one alert page in its own context of the shared browser"""
+    context = await new_scrape_context(browser, cookies)
+    page = await context.new_page()
+    try:
+        return await scrape_alerts(page, url)
+    finally:
+        await context.close()
+
+
+async def scrape_with_browser(include_alerts=True, cookies=None):
+    """Scrape with Playwright; returns (alert_sightings, recent_sightings)"""
+    alert_sightings = []
+    recent_sightings = []
 
     async with async_playwright() as p:
         browser = await p.chromium.launch(
             headless=True,  # Set to False for debugging
-            args=['--disable-blink-features=AutomationControlled']
+            args=BROWSER_ARGS,
+            chromium_sandbox=False
         )
 
-        context = await browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-        )
-
-        page = await context.new_page()
-
         try:
-            all_sightings = []
+            if include_alerts and EBIRD_ALERT_URLS:
+                # Scrape the first page alone so any login happens once and is
+                # saved to STATE_FILE before the other contexts are created
+                first_url, *other_urls = EBIRD_ALERT_URLS
+                alert_sightings = await scrape_one(browser, first_url, cookies)
 
-            # Scrape alert data (notable/rare birds)
-            logger.info("Scraping alert data...")
-            alert_sightings = await scrape_alerts(page)
-            all_sightings.extend(alert_sightings)
-            logger.info(f"Got {len(alert_sightings)} sightings from alerts")
+                # The rest get one context each, all sharing a single browser process
+                results = await asyncio.gather(*(scrape_one(browser, url, cookies) for url in other_urls))
+                alert_sightings += [sighting for result in results for sighting in result]
 
             # Scrape recent observations if enabled
             if FETCH_RECENT_OBSERVATIONS:
                 logger.info("Scraping recent observations...")
-                recent_sightings = await scrape_recent_observations(page)
-                all_sightings.extend(recent_sightings)
-                logger.info(f"Got {len(recent_sightings)} recent observations")
+                context = await new_scrape_context(browser, cookies)
+                page = await context.new_page()
+                try:
+                    recent_sightings = await scrape_recent_observations(page)
+                finally:
+                    await context.close()
+
+        finally:
+            await browser.close()
+            logger.info("Browser closed")
+
+    return alert_sightings, recent_sightings
 
-            # Remove duplicates
-            all_sightings = deduplicate_sightings(all_sightings)
-            logger.info(f"Total unique sightings: {len(all_sightings)}")
 
-            if all_sightings:
-                output = create_output_json(all_sightings, status="success")
-                logger.info(f"Successfully scraped {len(all_sightings)} sightings")
-            else:
-                output = create_output_json([], status="warning", error_message="No sightings found")
-                logger.warning("No valid sightings found")
+async def main():
+    """Main scraping function"""
+    logger.info("Starting eBird scraper...")
 
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    # Validate environment variables
+    if not os.environ.get("EBIRD_USERNAME") or not os.environ.get("EBIRD_PASSWORD"):
+        logger.error("EBIRD_USERNAME and EBIRD_PASSWORD environment variables must be set")
+        return
 
-            # Write JSON
-            with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+    try:
+        all_sightings = []
+        recent_sightings = []
+
+        # Scrape alert data (notable/rare birds) - plain HTTP first, browser as fallback
+        logger.info("Scraping alert data...")
+        if not EBIRD_ALERT_URLS:
+            logger.info("No alert URLs configured in EBIRD_ALERT_URLS")
+        async with httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            timeout=30
+        ) as session:
+            alert_sightings = await fetch_static(session)
+            cookies = browser_cookies(session.cookies.jar)
+
+        if alert_sightings is None:
+            logger.info("Falling back to browser for alert data")
+            alert_sightings, recent_sightings = await scrape_with_browser(cookies=cookies)
+        elif FETCH_RECENT_OBSERVATIONS:
+            _, recent_sightings = await scrape_with_browser(include_alerts=False, cookies=cookies)
+
+        all_sightings.extend(alert_sightings)
+        logger.info(f"Got {len(alert_sightings)} sightings from alerts")
+
+        if FETCH_RECENT_OBSERVATIONS:
+            all_sightings.extend(recent_sightings)
+            logger.info(f"Got {len(recent_sightings)} recent observations")
+
+        # Remove duplicates
+        all_sightings = deduplicate_sightings(all_sightings)
+        logger.info(f"Total unique sightings: {len(all_sightings)}")
+
+        if all_sightings:
+            output = create_output_json(all_sightings, status="success")
+            logger.info(f"Successfully scraped {len(all_sightings)} sightings")
+        else:
+            output = create_output_json([], status="warning", error_message="No sightings found")
+            logger.warning("No valid sightings found")
 
-            logger.info(f"Data saved to {OUTPUT_FILE}")
+        # Write JSON
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
 
-        except Exception as e:
-            logger.error(f"Scraping failed: {e}")
-            # Write error state
-            error_output = create_output_json(
-                [],
-                status="error",
-                error_message=str(e)
-            )
+        logger.info(f"Data saved to {OUTPUT_FILE}")
 
-            os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-            with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-                json.dump(error_output, f, indent=2)
+    except Exception as e:
+        logger.error(f"Scraping failed: {e}")
+        # Write error state
+        error_output = create_output_json(
+            [],
+            status="error",
+            error_message=str(e)
+        )
 
-            logger.info("Error state saved to JSON")
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(error_output, option=orjson.OPT_INDENT_2))
 
-        finally:
-            await context.close()
-            await browser.close()
-            logger.info("Browser closed")
+        logger.info("Error state saved to JSON")
 
 
 if __name__ == "__main__":